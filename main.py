@@ -2,16 +2,38 @@
 Nion Orchestration Engine
 Main entry point for the orchestration system
 """
-import json
 import sys
 import os
-import glob
+import logging
+import mmap
 from pathlib import Path
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+from src import json_utils
 from src.models import InputMessage
 from src.orchestration_engine import OrchestrationEngine
 from src.output_formatter import OutputFormatter
 
+# Test cases are dominated by Gemini round-trips, so batches run them on a thread pool
+MAX_PARALLEL_TESTS = 8
+
+# Test case files at least this large are memory-mapped instead of read into memory
+MMAP_THRESHOLD_BYTES = 1 << 20
+
+
+def write_stdout(text: str):
+    """Write text to stdout in a single call on the binary buffer, bypassing print()"""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(text)
+        return
+    
+    # Flush pending print() output first so ordering is preserved
+    sys.stdout.flush()
+    buffer.write(text.encode(sys.stdout.encoding or "utf-8", sys.stdout.errors or "strict"))
+    buffer.flush()
+
 
 def save_output_to_file(input_file: str, output: str):
     """Save orchestration output to a file in the outputs directory"""
@@ -25,40 +47,49 @@ def save_output_to_file(input_file: str, output: str):
     test_case_name = input_path.stem  # Gets filename without extension
     
     # Create output filename with timestamp
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
     output_filename = f"{test_case_name}_result.txt"
     output_path = outputs_dir / output_filename
     
-    # Write output to file
-    with open(output_path, 'w') as f:
-        f.write(f"Generated: {timestamp}\n")
-        f.write(f"Input: {input_file}\n")
-        f.write("=" * 70 + "\n\n")
-        f.write(output)
+    # Write output to file, building the whole file in memory for a single write
+    payload = f"Generated: {timestamp}\nInput: {input_file}\n{'=' * 70}\n\n{output}"
+    with open(output_path, 'w', buffering=1 << 16) as f:
+        f.write(payload)
     
     print(f"\n✅ Output saved to: {output_path}")
 
 
-def process_single_test(input_file: str):
-    """Process a single test case file"""
-    try:
-        # Read input message
-        with open(input_file, 'r') as f:
-            input_data = json.load(f)
-        
-        # Parse input message
-        message = InputMessage(**input_data)
-        
-        # Initialize orchestration engine
-        engine = OrchestrationEngine()
-        
-        # Process message
-        result = engine.process_message(message)
+def load_test_case(input_file: str) -> dict:
+    """Load a test case JSON file, parsing large files straight from a memory map"""
+    with open(input_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD_BYTES:
+            return json_utils.loads(f.read())
         
-        # Format and print output
-        formatter = OutputFormatter()
-        output = formatter.format(result)
-        print(output)
+        # Avoid copying multi-MB inputs into an intermediate bytes object
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return json_utils.loads(view)
+
+
+def render_test(input_file: str, engine: OrchestrationEngine, formatter: OutputFormatter) -> str:
+    """Run a test case file through the engine and return the formatted output"""
+    # Read input message
+    input_data = load_test_case(input_file)
+    
+    # Parse input message
+    message = InputMessage.from_dict(input_data)
+    
+    # Process message
+    result = engine.process_message(message)
+    
+    # Format output
+    return formatter.format(result)
+
+
+def report_test(input_file: str, render: Callable[[], str]) -> bool:
+    """Print and save the output produced by render(), reporting any failure"""
+    try:
+        output = render()
+        write_stdout(output + "\n")
         
         # Save output to file
         save_output_to_file(input_file, output)
@@ -67,7 +98,7 @@ def process_single_test(input_file: str):
     except FileNotFoundError:
         print(f"Error: Input file '{input_file}' not found")
         return False
-    except json.JSONDecodeError as e:
+    except json_utils.JSONDecodeError as e:
         print(f"Error: Invalid JSON in input file: {e}")
         return False
     except Exception as e:
@@ -77,9 +108,42 @@ def process_single_test(input_file: str):
         return False
 
 
+def process_single_test(input_file: str, engine: OrchestrationEngine, formatter: OutputFormatter):
+    """Process a single test case file using a shared engine and formatter"""
+    return report_test(input_file, lambda: render_test(input_file, engine, formatter))
+
+
+def run_test_batch(test_files: List[str]):
+    """Run several test cases concurrently, report them in order, and exit non-zero on failure"""
+    success_count = 0
+    total_count = len(test_files)
+    
+    # The engine and formatter keep no per-message state, so all workers share one of each
+    engine = OrchestrationEngine()
+    formatter = OutputFormatter()
+    
+    # Gemini round-trips of different test cases overlap on the pool, results print in order
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_TESTS, total_count)) as executor:
+        futures = [executor.submit(render_test, test_file, engine, formatter) for test_file in test_files]
+        for test_file, future in zip(test_files, futures):
+            write_stdout(f"\n{'='*70}\nProcessing: {test_file}\n{'='*70}\n")
+            if report_test(test_file, future.result):
+                success_count += 1
+    
+    print(f"\n{'='*70}")
+    print(f"Summary: {success_count}/{total_count} test cases completed successfully")
+    print('='*70)
+    
+    if success_count < total_count:
+        sys.exit(1)
+
+
 def main():
     """Main function to run the orchestration engine"""
     
+    # Diagnostics such as L1 reasoning are logged at DEBUG; set LOG_LEVEL=DEBUG to see them
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING").upper(), format="%(message)s")
+    
     # Check if input is provided
     if len(sys.argv) < 2:
         print("Usage:")
@@ -95,60 +159,38 @@ def main():
     # Handle --all flag
     if sys.argv[1] == "--all":
         print("Running all test cases...\n")
-        test_files = sorted(glob.glob("test_cases/test_case_*.json"))
+        test_files = []
+        if os.path.isdir("test_cases"):
+            test_files = sorted(
+                entry.path for entry in os.scandir("test_cases")
+                if entry.name.startswith("test_case_") and entry.name.endswith(".json")
+            )
         
         if not test_files:
             print("Error: No test case files found in test_cases/ directory")
             sys.exit(1)
         
-        success_count = 0
-        total_count = len(test_files)
-        
-        for test_file in test_files:
-            print(f"\n{'='*70}")
-            print(f"Processing: {test_file}")
-            print('='*70)
-            if process_single_test(test_file):
-                success_count += 1
-        
-        print(f"\n{'='*70}")
-        print(f"Summary: {success_count}/{total_count} test cases completed successfully")
-        print('='*70)
-        
-        if success_count < total_count:
-            sys.exit(1)
+        run_test_batch(test_files)
         return
     
     # Handle multiple specific test case names (without paths/extensions)
     if not sys.argv[1].endswith('.json'):
         print("Running specified test cases...\n")
-        success_count = 0
-        total_count = len(sys.argv) - 1
+        test_files = []
         
         for arg in sys.argv[1:]:
             # Convert test case name to file path
-            if arg.startswith("test_cases/"):
-                test_file = arg if arg.endswith('.json') else f"{arg}.json"
-            else:
-                test_file = f"test_cases/{arg}.json" if arg.endswith('.json') else f"test_cases/{arg}.json"
-            
-            print(f"\n{'='*70}")
-            print(f"Processing: {test_file}")
-            print('='*70)
-            if process_single_test(test_file):
-                success_count += 1
+            test_file = arg if arg.endswith('.json') else f"{arg}.json"
+            if not test_file.startswith("test_cases/"):
+                test_file = f"test_cases/{test_file}"
+            test_files.append(test_file)
         
-        print(f"\n{'='*70}")
-        print(f"Summary: {success_count}/{total_count} test cases completed successfully")
-        print('='*70)
-        
-        if success_count < total_count:
-            sys.exit(1)
+        run_test_batch(test_files)
         return
     
     # Handle single test case file
     input_file = sys.argv[1]
-    if not process_single_test(input_file):
+    if not process_single_test(input_file, OrchestrationEngine(), OutputFormatter()):
         sys.exit(1)
 
 
@@ -1,7 +1,7 @@
 """
 Agent registry and configuration
 """
-from typing import Dict, List, Set
+from typing import Dict, FrozenSet, Tuple
 from enum import Enum
 
 
@@ -33,8 +33,8 @@ class CrossCuttingAgent(str, Enum):
 
 
 # L2 to L3 Agent Mapping (Visibility Rules)
-L2_TO_L3_MAPPING: Dict[str, List[str]] = {
-    "TRACKING_EXECUTION": [
+L2_TO_L3_MAPPING: Dict[str, Tuple[str, ...]] = {
+    "TRACKING_EXECUTION": (
         L3Agent.ACTION_ITEM_EXTRACTION.value,
         L3Agent.ACTION_ITEM_VALIDATION.value,
         L3Agent.ACTION_ITEM_TRACKING.value,
@@ -44,39 +44,49 @@ L2_TO_L3_MAPPING: Dict[str, List[str]] = {
         L3Agent.ISSUE_TRACKING.value,
         L3Agent.DECISION_EXTRACTION.value,
         L3Agent.DECISION_TRACKING.value,
-    ],
-    "COMMUNICATION_COLLABORATION": [
+    ),
+    "COMMUNICATION_COLLABORATION": (
         L3Agent.QNA.value,
         L3Agent.REPORT_GENERATION.value,
         L3Agent.MESSAGE_DELIVERY.value,
         L3Agent.MEETING_ATTENDANCE.value,
-    ],
-    "LEARNING_IMPROVEMENT": [
+    ),
+    "LEARNING_IMPROVEMENT": (
         L3Agent.INSTRUCTION_LED_LEARNING.value,
-    ],
+    ),
 }
 
 
 # Cross-Cutting Agents accessible by all layers
-CROSS_CUTTING_AGENTS: List[str] = [
+CROSS_CUTTING_AGENTS: Tuple[str, ...] = (
     CrossCuttingAgent.KNOWLEDGE_RETRIEVAL.value,
     CrossCuttingAgent.EVALUATION.value,
-]
+)
+
+_CROSS_CUTTING_AGENT_SET: FrozenSet[str] = frozenset(CROSS_CUTTING_AGENTS)
 
 
 # L1 can see L2 domains and Cross-Cutting agents
-L1_VISIBLE_AGENTS: List[str] = [
+L1_VISIBLE_AGENTS: Tuple[str, ...] = (
     "L2:TRACKING_EXECUTION",
     "L2:COMMUNICATION_COLLABORATION",
     "L2:LEARNING_IMPROVEMENT",
-] + [f"L3:{agent}" for agent in CROSS_CUTTING_AGENTS]
+    "L3:knowledge_retrieval",
+    "L3:evaluation",
+)
+
+
+# L3 agents visible to each L2 domain, precomputed once (own agents + Cross-Cutting)
+_L2_VISIBLE_L3_AGENTS: Dict[str, Tuple[str, ...]] = {
+    domain: agents + CROSS_CUTTING_AGENTS for domain, agents in L2_TO_L3_MAPPING.items()
+}
 
 
-def get_l3_agents_for_l2(l2_domain: str) -> List[str]:
+def get_l3_agents_for_l2(l2_domain: str) -> Tuple[str, ...]:
     """Get L3 agents visible to a specific L2 domain"""
-    return L2_TO_L3_MAPPING.get(l2_domain, []) + CROSS_CUTTING_AGENTS
+    return _L2_VISIBLE_L3_AGENTS.get(l2_domain, CROSS_CUTTING_AGENTS)
 
 
 def is_cross_cutting_agent(agent_name: str) -> bool:
     """Check if an agent is a cross-cutting agent"""
-    return agent_name in CROSS_CUTTING_AGENTS
+    return agent_name in _CROSS_CUTTING_AGENT_SET
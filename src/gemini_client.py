@@ -2,44 +2,36 @@
 Gemini AI Integration for enhanced L1 reasoning
 """
 import os
-import json
-from typing import Dict, Any
-from dotenv import load_dotenv
-import google.generativeai as genai
+import re
+import string
+import threading
+import time
+import functools
+from collections import OrderedDict
+from typing import Dict, Any, FrozenSet, Optional, Set, Tuple
+from src import json_utils
 
-load_dotenv()
 
+# Keyword groups used by the rule-based fallback, keyed by the signal they indicate
+_FALLBACK_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "meeting": ("meeting", "transcript", "demo"),
+    "status": ("status", "what"),
+    "feasibility": ("can we", "should we"),
+    "decision_request": ("decide", "prioritize"),
+    "escalation": ("blocked", "urgent", "escalate", "threat"),
+    "action_items": ("add", "create", "implement", "fix"),
+    "risks": ("risk", "concern", "timeline", "deadline"),
+    "issues": ("blocked", "down", "bug", "issue", "problem"),
+    "decisions": ("decide", "should", "prioritize", "choose"),
+}
 
-class GeminiClient:
-    """Client for Google Gemini API"""
-    
-    def __init__(self):
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            print("Warning: GOOGLE_API_KEY not found in environment variables.")
-            print("The system will use rule-based reasoning instead of AI-enhanced reasoning.")
-            self.model = None
-        else:
-            try:
-                genai.configure(api_key=api_key)
-                # Use the latest available Gemini model
-                self.model = genai.GenerativeModel('models/gemini-2.0-flash')
-                print("✅ Gemini AI initialized successfully!")
-            except Exception as e:
-                print(f"Warning: Error configuring Gemini API: {e}")
-                print("The system will use rule-based reasoning instead of AI-enhanced reasoning.")
-                self.model = None
-    
-    def analyze_intent(self, message_content: str, sender_role: str, source: str) -> Dict[str, Any]:
-        """Use Gemini to analyze message intent"""
-        if not self.model:
-            return self._fallback_intent_analysis(message_content)
-        
-        prompt = f"""You are Nion, an expert AI Technical Program Manager. Analyze the following project message with high precision.
 
-Message: "{message_content}"
-Sender Role: {sender_role}
-Source: {source}
+# Use the latest available Gemini model
+GEMINI_MODEL_NAME = 'models/gemini-2.0-flash'
+
+# Static intent analysis instructions, sent as the model's system instruction so every
+# request shares the same prefix and only the message-specific part varies
+_INTENT_SYSTEM_INSTRUCTION = """You are Nion, an expert AI Technical Program Manager. Analyze the project message you are given with high precision.
 
 ### Instructions
 1. **Classify Intent**: Choose exactly one of the following:
@@ -62,7 +54,7 @@ Source: {source}
    - `has_decisions`: Questions requiring a choice or approval.
 
 Respond ONLY with valid JSON in this exact format:
-{{
+{
   "intent": "intent_type",
   "has_action_items": true/false,
   "has_risks": true/false,
@@ -70,20 +62,206 @@ Respond ONLY with valid JSON in this exact format:
   "has_decisions": true/false,
   "urgency": "low/medium/high",
   "reasoning": "Explain clearly why you classified the urgency and flags this way."
-}}"""
+}"""
+
+# Per-message part of the intent analysis prompt, parsed once and filled in per message
+_INTENT_PROMPT_TEMPLATE = string.Template("""Message: "$message"
+Sender Role: $sender_role
+Source: $source""")
+
+
+def _build_keyword_groups() -> Dict[str, FrozenSet[str]]:
+    """Map every fallback keyword to the frozen set of groups it signals"""
+    keyword_groups: Dict[str, Set[str]] = {}
+    for group, keywords in _FALLBACK_KEYWORDS.items():
+        for keyword in keywords:
+            keyword_groups.setdefault(keyword, set()).add(group)
+    
+    # A keyword that extends another (e.g. "should we" / "should") also signals its
+    # groups, because the scan only reports the longest keyword at each position
+    return {
+        keyword: frozenset().union(*(
+            other_groups for other, other_groups in keyword_groups.items()
+            if keyword.startswith(other)
+        ))
+        for keyword in keyword_groups
+    }
+
+
+_KEYWORD_GROUPS: Dict[str, FrozenSet[str]] = _build_keyword_groups()
+_KEYWORD_GROUP_COUNT = len(_FALLBACK_KEYWORDS)
+
+# Single scan over the message for all keywords; the lookahead allows overlapping hits
+_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_KEYWORD_GROUPS, key=len, reverse=True)) + "))"
+)
+
+
+def _scan_keyword_groups(content_lower: str) -> Set[str]:
+    """Find the keyword groups present in lowercased content in one pass"""
+    groups = set()
+    for match in _KEYWORD_RE.finditer(content_lower):
+        groups |= _KEYWORD_GROUPS[match.group(1)]
+        # Stop scanning long messages once every group has been seen
+        if len(groups) == _KEYWORD_GROUP_COUNT:
+            break
+    return groups
+
+
+def _strip_code_fence(text: str) -> str:
+    """Return the body of the first markdown code fence, or the text unchanged if there is none"""
+    start = text.find("```json")
+    if start != -1:
+        start += len("```json")
+    else:
+        start = text.find("```")
+        if start == -1:
+            return text
+        start += len("```")
+    
+    # Slice once instead of splitting the whole response into lists
+    end = text.find("```", start)
+    return text[start:end].strip() if end != -1 else text[start:].strip()
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_fallback_intent_analysis(
+    content_lower: str, source_lower: str, has_question: bool
+) -> Tuple[Tuple[str, Any], ...]:
+    """Rule-based intent analysis over normalized input, memoized as immutable (key, value) pairs"""
+    groups = _scan_keyword_groups(content_lower)
+    
+    # Determine intent (check meeting first before escalation keywords)
+    if source_lower == "meeting" or "meeting" in groups:
+        intent = "meeting_update"
+    elif has_question and "status" in groups:
+        intent = "status_query"
+    elif has_question and "feasibility" in groups:
+        intent = "feasibility_query"
+    elif "decision_request" in groups:
+        intent = "decision_request"
+    elif "escalation" in groups:
+        intent = "escalation"
+    else:
+        intent = "general_request"
+    
+    return tuple({
+        "intent": intent,
+        "has_action_items": "action_items" in groups,
+        "has_risks": "risks" in groups,
+        "has_issues": "issues" in groups,
+        "has_decisions": "decisions" in groups,
+        "urgency": "high" if intent == "escalation" else "medium" if has_question else "low",
+        "reasoning": "Rule-based analysis (API not configured)"
+    }.items())
+
+
+@functools.cache
+def _load_environment():
+    """Load variables from a .env file, once per process"""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+class IntentCache:
+    """Thread-safe LRU cache of Gemini intent analyses with a time-to-live"""
+    
+    def __init__(self, maxsize: int = 256, ttl_seconds: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(message_content: str, sender_role: str, source: str) -> Tuple[str, str, str]:
+        """Normalize case and whitespace so near-identical messages share an entry"""
+        return (
+            " ".join(message_content.casefold().split()),
+            " ".join(sender_role.casefold().split()),
+            source.strip().casefold(),
+        )
+    
+    def get(self, key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached analysis, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, analysis = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(analysis)
+    
+    def put(self, key: Tuple[str, str, str], analysis: Dict[str, Any]):
+        """Store an analysis, evicting the least recently used entries beyond maxsize"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), dict(analysis))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop every cached analysis, e.g. after project state changes"""
+        with self._lock:
+            self._entries.clear()
+
+
+class GeminiClient:
+    """Client for Google Gemini API"""
+    
+    def __init__(self):
+        self.intent_cache = IntentCache()
+        _load_environment()
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            print("Warning: GOOGLE_API_KEY not found in environment variables.")
+            print("The system will use rule-based reasoning instead of AI-enhanced reasoning.")
+            self.model = None
+            self.intent_model = None
+        else:
+            try:
+                # Imported lazily: the SDK pulls in grpc/protobuf, which the fallback path never needs
+                import google.generativeai as genai
+                genai.configure(api_key=api_key)
+                self.model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+                # Intent analysis carries its static instructions as a system instruction
+                self.intent_model = genai.GenerativeModel(
+                    GEMINI_MODEL_NAME, system_instruction=_INTENT_SYSTEM_INSTRUCTION
+                )
+                print("✅ Gemini AI initialized successfully!")
+            except Exception as e:
+                print(f"Warning: Error configuring Gemini API: {e}")
+                print("The system will use rule-based reasoning instead of AI-enhanced reasoning.")
+                self.model = None
+                self.intent_model = None
+    
+    def analyze_intent(self, message_content: str, sender_role: str, source: str) -> Dict[str, Any]:
+        """Use Gemini to analyze message intent"""
+        if not self.intent_model:
+            return self._fallback_intent_analysis(message_content, source)
+        
+        # Repeated messages reuse an earlier analysis instead of another round-trip
+        cache_key = IntentCache.make_key(message_content, sender_role, source)
+        cached = self.intent_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        prompt = _INTENT_PROMPT_TEMPLATE.substitute(
+            message=message_content, sender_role=sender_role, source=source
+        )
         
         try:
-            response = self.model.generate_content(prompt)
+            response = self.intent_model.generate_content(prompt)
             # Extract JSON from response
             response_text = response.text.strip()
             
             # Remove markdown code blocks if present
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
+            response_text = _strip_code_fence(response_text)
             
-            result = json.loads(response_text)
+            result = json_utils.loads(response_text)
+            self.intent_cache.put(cache_key, result)
             return result
         except Exception as e:
             print(f"Warning: Gemini API error: {e}")
@@ -93,63 +271,35 @@ Respond ONLY with valid JSON in this exact format:
     def _fallback_intent_analysis(self, content: str, source: str = "") -> Dict[str, Any]:
         """Fallback rule-based intent analysis when API is not available"""
         content_lower = content.lower()
+        has_q = "?" in content
         source_lower = source.lower() if source else ""
-        
-        # Determine intent (check meeting first before escalation keywords)
-        if source_lower == "meeting" or "meeting" in content_lower or "transcript" in content_lower or "demo" in content_lower:
-            intent = "meeting_update"
-        elif "?" in content and ("status" in content_lower or "what" in content_lower):
-            intent = "status_query"
-        elif "?" in content and ("can we" in content_lower or "should we" in content_lower):
-            intent = "feasibility_query"
-        elif "decide" in content_lower or "prioritize" in content_lower:
-            intent = "decision_request"
-        elif "blocked" in content_lower or "urgent" in content_lower or "escalate" in content_lower or "threat" in content_lower:
-            intent = "escalation"
-        else:
-            intent = "general_request"
-        
-        return {
-            "intent": intent,
-            "has_action_items": any(kw in content_lower for kw in ["add", "create", "implement", "fix"]),
-            "has_risks": any(kw in content_lower for kw in ["risk", "concern", "timeline", "deadline"]),
-            "has_issues": any(kw in content_lower for kw in ["blocked", "down", "bug", "issue", "problem"]),
-            "has_decisions": any(kw in content_lower for kw in ["decide", "should", "prioritize", "choose"]),
-            "urgency": "high" if intent == "escalation" else "medium" if "?" in content else "low",
-            "reasoning": "Rule-based analysis (API not configured)"
-        }
+        return dict(_cached_fallback_intent_analysis(content_lower, source_lower, has_q))
     
     def enhance_response(self, context: Dict[str, Any], message_content: str) -> str:
         """Use Gemini to generate more natural responses"""
         if not self.model:
             return None  # Use default response generation
         
-        # Helper to format list items into strings
-        def format_list(items):
-            if not items:
-                return "None"
-            return "\n  - ".join([str(item) for item in items])
-
-        # Prepare context strings
-        knowledge_info = format_list(context.get('knowledge', []))
-        action_items_info = format_list(context.get('action_items', []))
-        risks_info = format_list(context.get('risks', []))
-        decisions_info = format_list(context.get('decisions', []))
+        # With no context at all there is nothing to ground the answer on,
+        # so skip the Gemini round-trip and use default response generation
+        if not any(context.get(key) for key in ("knowledge", "action_items", "risks", "decisions")):
+            return None
+        
+        # Serialize every context section in one pass instead of joining each list separately
+        context_json = json_utils.dumps_pretty({
+            "project_info": context.get("knowledge") or [],
+            "action_items": context.get("action_items") or [],
+            "risks": context.get("risks") or [],
+            "decisions": context.get("decisions") or [],
+        })
         
         prompt = f"""You are Nion, an advanced AI Program Manager. 
 Generate a professional, structured, and gap-aware response using the following EXACT format:
 
 Original Message: "{message_content}"
 
-### Context Available
-- **Project Info**: 
-  {knowledge_info}
-- **Action Items**: 
-  {action_items_info}
-- **Risks**: 
-  {risks_info}
-- **Decisions**: 
-  {decisions_info}
+### Context Available (JSON)
+{context_json}
 
 ### Response Format (REQUIRED STRUCTURE)
 Generate your response in this exact format:
@@ -189,3 +339,9 @@ Response (plain text, no JSON):"""
         except Exception as e:
             print(f"Warning: Gemini response generation error: {e}")
             return None  # Fall back to default
+
+
+@functools.lru_cache(maxsize=None)
+def get_gemini_client() -> GeminiClient:
+    """Get the shared Gemini client so the API is only configured once per process"""
+    return GeminiClient()
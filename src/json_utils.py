@@ -0,0 +1,31 @@
+"""
+JSON helpers
+Uses orjson when it is installed and falls back to the standard json module otherwise
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[str, bytes, memoryview]) -> Any:
+    """Parse a JSON document from str, bytes, or a memoryview (e.g. over an mmap)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps_pretty(obj: Any) -> str:
+    """Serialize obj as 2-space indented JSON text, stringifying unsupported values"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, default=str, indent=2, ensure_ascii=False)
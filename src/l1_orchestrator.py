@@ -2,18 +2,91 @@
 L1 Orchestrator - The main reasoning and planning layer
 Ingests messages, analyzes intent, identifies gaps, and creates execution plans
 """
-from typing import List, Dict, Any
-from src.models import InputMessage, Task, L1Plan, TaskStatus
-from src.agents import L1_VISIBLE_AGENTS, is_cross_cutting_agent
-from src.gemini_client import GeminiClient
+import logging
+from typing import List, Dict, Tuple
+from src.models import InputMessage, Task, TaskSpec, L1Plan
+from src.gemini_client import get_gemini_client
+
+logger = logging.getLogger(__name__)
+
+
+# Execution plan templates per intent. Plan shapes are static, so the immutable TaskSpecs are
+# defined once and shared by every Task materialized from them.
+PLAN_TEMPLATES: Dict[str, Tuple[TaskSpec, ...]] = {
+    "status_query": (
+        # Retrieve context
+        TaskSpec("L3:knowledge_retrieval", "Retrieve project context and current status", is_cross_cutting=True),
+        # Check for any tracked items
+        TaskSpec("L2:TRACKING_EXECUTION", "Retrieve tracked action items and status"),
+        # Formulate response
+        TaskSpec("L2:COMMUNICATION_COLLABORATION", "Formulate status response", depends_on=(0, 1)),
+        # Send response
+        TaskSpec("L2:COMMUNICATION_COLLABORATION", "Send response to sender", depends_on=(2,)),
+    ),
+    "feasibility_query": (
+        # Extract action items, risks and the decision needed
+        TaskSpec("L2:TRACKING_EXECUTION", "Extract action items from request"),
+        TaskSpec("L2:TRACKING_EXECUTION", "Extract risks from request"),
+        TaskSpec("L2:TRACKING_EXECUTION", "Extract decision needed"),
+        # Retrieve context
+        TaskSpec("L3:knowledge_retrieval", "Retrieve project context and timeline", is_cross_cutting=True),
+        # Formulate gap-aware response
+        TaskSpec("L2:COMMUNICATION_COLLABORATION", "Formulate gap-aware response", depends_on=(0, 1, 2, 3)),
+        # Evaluate response
+        TaskSpec("L3:evaluation", "Evaluate response before sending", depends_on=(4,), is_cross_cutting=True),
+        # Send response
+        TaskSpec("L2:COMMUNICATION_COLLABORATION", "Send response to sender", depends_on=(5,)),
+    ),
+    "decision_request": (
+        # Extract decision
+        TaskSpec("L2:TRACKING_EXECUTION", "Extract decision from request"),
+        # Extract relevant context
+        TaskSpec("L3:knowledge_retrieval", "Retrieve relevant context for decision", is_cross_cutting=True),
+        # Formulate response with decision framework
+        TaskSpec("L2:COMMUNICATION_COLLABORATION", "Formulate decision framework response", depends_on=(0, 1)),
+        # Send response
+        TaskSpec("L2:COMMUNICATION_COLLABORATION", "Send response to sender", depends_on=(2,)),
+    ),
+    "escalation": (
+        # Extract issues and risks
+        TaskSpec("L2:TRACKING_EXECUTION", "Extract issues from escalation"),
+        TaskSpec("L2:TRACKING_EXECUTION", "Extract risks from escalation"),
+        # Retrieve context
+        TaskSpec("L3:knowledge_retrieval", "Retrieve escalation context", is_cross_cutting=True),
+        # Formulate urgent response
+        TaskSpec("L2:COMMUNICATION_COLLABORATION", "Formulate urgent response with action plan", depends_on=(0, 1, 2)),
+        # Send response immediately
+        TaskSpec("L2:COMMUNICATION_COLLABORATION", "Send urgent response to sender", depends_on=(3,)),
+    ),
+    "meeting_update": (
+        # Process meeting content
+        TaskSpec("L2:COMMUNICATION_COLLABORATION", "Process meeting transcript"),
+        # Extract action items, issues and decisions
+        TaskSpec("L2:TRACKING_EXECUTION", "Extract action items from meeting"),
+        TaskSpec("L2:TRACKING_EXECUTION", "Extract issues from meeting"),
+        TaskSpec("L2:TRACKING_EXECUTION", "Extract decisions from meeting"),
+        # Generate meeting summary
+        TaskSpec("L2:COMMUNICATION_COLLABORATION", "Generate meeting summary report", depends_on=(0, 1, 2, 3)),
+    ),
+    "general_request": (
+        # Extract any action items
+        TaskSpec("L2:TRACKING_EXECUTION", "Extract action items from message"),
+        # Retrieve context
+        TaskSpec("L3:knowledge_retrieval", "Retrieve project context", is_cross_cutting=True),
+        # Formulate acknowledgment response
+        TaskSpec("L2:COMMUNICATION_COLLABORATION", "Formulate acknowledgment response", depends_on=(0, 1)),
+    ),
+}
+
+# Plan used for intents without a template of their own
+DEFAULT_PLAN_TEMPLATE = PLAN_TEMPLATES["general_request"]
 
 
 class L1Orchestrator:
     """L1 Orchestrator - Reasons about intent and generates plans"""
     
-    def __init__(self):
-        self.task_counter = 0
-        self.gemini_client = GeminiClient()
+    def __init__(self, gemini_client=None):
+        self.gemini_client = gemini_client or get_gemini_client()
     
     def ingest_and_reason(self, message: InputMessage) -> L1Plan:
         """
@@ -24,8 +97,6 @@ class L1Orchestrator:
         4. Select strategy
         5. Generate plan
         """
-        self.task_counter = 0
-        
         # Use Gemini AI to analyze intent
         analysis = self.gemini_client.analyze_intent(
             message.content,
@@ -34,265 +105,22 @@ class L1Orchestrator:
         )
         
         intent = analysis.get("intent", "general_request")
-        print(f"\n[L1 Reasoning] Intent: {intent} | Urgency: {analysis.get('urgency', 'medium')}")
-        print(f"[L1 Reasoning] {analysis.get('reasoning', 'No reasoning provided')}\n")
+        if logger.isEnabledFor(logging.DEBUG):
+            # Structured fields ride on the records so handlers need not parse the message text
+            fields = {"intent": intent, "urgency": analysis.get("urgency", "medium"), "source": message.source}
+            logger.debug("[L1 Reasoning] Intent: %s | Urgency: %s", intent, fields["urgency"], extra=fields)
+            logger.debug("[L1 Reasoning] %s", analysis.get("reasoning", "No reasoning provided"), extra=fields)
         
         # Generate plan based on intent
-        tasks = self._generate_plan(message, intent)
+        tasks = self._generate_plan(intent)
         
         return L1Plan(message=message, tasks=tasks)
     
-
-    
-    def _generate_plan(self, message: InputMessage, intent: str) -> List[Task]:
+    def _generate_plan(self, intent: str) -> List[Task]:
         """Generate execution plan based on intent"""
-        tasks = []
-        
-        if intent == "status_query":
-            tasks = self._plan_status_query(message)
-        elif intent == "feasibility_query":
-            tasks = self._plan_feasibility_query(message)
-        elif intent == "decision_request":
-            tasks = self._plan_decision_request(message)
-        elif intent == "escalation":
-            tasks = self._plan_escalation(message)
-        elif intent == "meeting_update":
-            tasks = self._plan_meeting_update(message)
-        else:
-            tasks = self._plan_general_request(message)
-        
-        return tasks
+        template = PLAN_TEMPLATES.get(intent, DEFAULT_PLAN_TEMPLATE)
+        return self._materialize(template)
     
-    def _plan_status_query(self, message: InputMessage) -> List[Task]:
-        """Plan for status query intent"""
-        tasks = []
-        
-        # Retrieve context
-        tasks.append(self._create_task(
-            "L3:knowledge_retrieval",
-            "Retrieve project context and current status",
-            is_cross_cutting=True
-        ))
-        
-        # Check for any tracked items
-        tasks.append(self._create_task(
-            "L2:TRACKING_EXECUTION",
-            "Retrieve tracked action items and status"
-        ))
-        
-        # Formulate response
-        tasks.append(self._create_task(
-            "L2:COMMUNICATION_COLLABORATION",
-            "Formulate status response",
-            depends_on=[tasks[0].task_id, tasks[1].task_id]
-        ))
-        
-        # Send response
-        tasks.append(self._create_task(
-            "L2:COMMUNICATION_COLLABORATION",
-            "Send response to sender",
-            depends_on=[tasks[2].task_id]
-        ))
-        
-        return tasks
-    
-    def _plan_feasibility_query(self, message: InputMessage) -> List[Task]:
-        """Plan for feasibility query intent"""
-        tasks = []
-        
-        # Extract action items
-        tasks.append(self._create_task(
-            "L2:TRACKING_EXECUTION",
-            "Extract action items from request"
-        ))
-        
-        # Extract risks
-        tasks.append(self._create_task(
-            "L2:TRACKING_EXECUTION",
-            "Extract risks from request"
-        ))
-        
-        # Extract decision needed
-        tasks.append(self._create_task(
-            "L2:TRACKING_EXECUTION",
-            "Extract decision needed"
-        ))
-        
-        # Retrieve context
-        tasks.append(self._create_task(
-            "L3:knowledge_retrieval",
-            "Retrieve project context and timeline",
-            is_cross_cutting=True
-        ))
-        
-        # Formulate gap-aware response
-        tasks.append(self._create_task(
-            "L2:COMMUNICATION_COLLABORATION",
-            "Formulate gap-aware response",
-            depends_on=[tasks[0].task_id, tasks[1].task_id, tasks[2].task_id, tasks[3].task_id]
-        ))
-        
-        # Evaluate response
-        tasks.append(self._create_task(
-            "L3:evaluation",
-            "Evaluate response before sending",
-            depends_on=[tasks[4].task_id],
-            is_cross_cutting=True
-        ))
-        
-        # Send response
-        tasks.append(self._create_task(
-            "L2:COMMUNICATION_COLLABORATION",
-            "Send response to sender",
-            depends_on=[tasks[5].task_id]
-        ))
-        
-        return tasks
-    
-    def _plan_decision_request(self, message: InputMessage) -> List[Task]:
-        """Plan for decision request intent"""
-        tasks = []
-        
-        # Extract decision
-        tasks.append(self._create_task(
-            "L2:TRACKING_EXECUTION",
-            "Extract decision from request"
-        ))
-        
-        # Extract relevant context
-        tasks.append(self._create_task(
-            "L3:knowledge_retrieval",
-            "Retrieve relevant context for decision",
-            is_cross_cutting=True
-        ))
-        
-        # Formulate response with decision framework
-        tasks.append(self._create_task(
-            "L2:COMMUNICATION_COLLABORATION",
-            "Formulate decision framework response",
-            depends_on=[tasks[0].task_id, tasks[1].task_id]
-        ))
-        
-        # Send response
-        tasks.append(self._create_task(
-            "L2:COMMUNICATION_COLLABORATION",
-            "Send response to sender",
-            depends_on=[tasks[2].task_id]
-        ))
-        
-        return tasks
-    
-    def _plan_escalation(self, message: InputMessage) -> List[Task]:
-        """Plan for urgent escalation intent"""
-        tasks = []
-        
-        # Extract issues
-        tasks.append(self._create_task(
-            "L2:TRACKING_EXECUTION",
-            "Extract issues from escalation"
-        ))
-        
-        # Extract risks
-        tasks.append(self._create_task(
-            "L2:TRACKING_EXECUTION",
-            "Extract risks from escalation"
-        ))
-        
-        # Retrieve context
-        tasks.append(self._create_task(
-            "L3:knowledge_retrieval",
-            "Retrieve escalation context",
-            is_cross_cutting=True
-        ))
-        
-        # Formulate urgent response
-        tasks.append(self._create_task(
-            "L2:COMMUNICATION_COLLABORATION",
-            "Formulate urgent response with action plan",
-            depends_on=[tasks[0].task_id, tasks[1].task_id, tasks[2].task_id]
-        ))
-        
-        # Send response immediately
-        tasks.append(self._create_task(
-            "L2:COMMUNICATION_COLLABORATION",
-            "Send urgent response to sender",
-            depends_on=[tasks[3].task_id]
-        ))
-        
-        return tasks
-    
-    def _plan_meeting_update(self, message: InputMessage) -> List[Task]:
-        """Plan for meeting update/transcript intent"""
-        tasks = []
-        
-        # Process meeting content
-        tasks.append(self._create_task(
-            "L2:COMMUNICATION_COLLABORATION",
-            "Process meeting transcript"
-        ))
-        
-        # Extract action items
-        tasks.append(self._create_task(
-            "L2:TRACKING_EXECUTION",
-            "Extract action items from meeting"
-        ))
-        
-        # Extract issues
-        tasks.append(self._create_task(
-            "L2:TRACKING_EXECUTION",
-            "Extract issues from meeting"
-        ))
-        
-        # Extract decisions
-        tasks.append(self._create_task(
-            "L2:TRACKING_EXECUTION",
-            "Extract decisions from meeting"
-        ))
-        
-        # Generate meeting summary
-        tasks.append(self._create_task(
-            "L2:COMMUNICATION_COLLABORATION",
-            "Generate meeting summary report",
-            depends_on=[tasks[0].task_id, tasks[1].task_id, tasks[2].task_id, tasks[3].task_id]
-        ))
-        
-        return tasks
-    
-    def _plan_general_request(self, message: InputMessage) -> List[Task]:
-        """Plan for general request intent"""
-        tasks = []
-        
-        # Extract any action items
-        tasks.append(self._create_task(
-            "L2:TRACKING_EXECUTION",
-            "Extract action items from message"
-        ))
-        
-        # Retrieve context
-        tasks.append(self._create_task(
-            "L3:knowledge_retrieval",
-            "Retrieve project context",
-            is_cross_cutting=True
-        ))
-        
-        # Formulate acknowledgment response
-        tasks.append(self._create_task(
-            "L2:COMMUNICATION_COLLABORATION",
-            "Formulate acknowledgment response",
-            depends_on=[tasks[0].task_id, tasks[1].task_id]
-        ))
-        
-        return tasks
-    
-    def _create_task(self, target: str, purpose: str, depends_on: List[str] = None, is_cross_cutting: bool = False) -> Task:
-        """Create a task with auto-incrementing ID"""
-        self.task_counter += 1
-        task_id = f"TASK-{self.task_counter:03d}"
-        
-        return Task(
-            task_id=task_id,
-            target_agent=target,
-            purpose=purpose,
-            depends_on=depends_on or [],
-            is_cross_cutting=is_cross_cutting
-        )
+    def _materialize(self, template: Tuple[TaskSpec, ...]) -> List[Task]:
+        """Create the tasks of a plan template with sequential IDs"""
+        return [Task(task_id=i, spec=spec) for i, spec in enumerate(template)]
@@ -2,176 +2,218 @@
 L2 Coordinator Implementations
 L2 agents receive directions from L1 and coordinate L3 agents
 """
-from typing import List, Dict, Any
-from src.models import Task, TaskStatus
-from src.agents import get_l3_agents_for_l2, is_cross_cutting_agent
+import re
+import functools
+import logging
+from typing import Dict, Any, FrozenSet, List, Mapping, Optional, Pattern, Tuple
+from src.models import Task, TaskSpec, TaskStatus
+from src.agents import get_l3_agents_for_l2
+from src.gemini_client import get_gemini_client
 from src.l3_agents import (
     ActionItemExtraction, RiskExtraction, IssueExtraction, DecisionExtraction,
-    QnA, ReportGeneration, MessageDelivery, MeetingAttendance
+    CombinedExtraction, QnA, ReportGeneration, MessageDelivery, MeetingAttendance, EMPTY_CONTEXT
 )
 
+logger = logging.getLogger(__name__)
+
+
+# Purpose keywords that select each L3 agent, in dispatch priority order
+_TRACKING_PURPOSE_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("action_item_extraction", ("action item",)),
+    ("risk_extraction", ("risk",)),
+    ("issue_extraction", ("issue",)),
+    ("decision_extraction", ("decision",)),
+)
+
+_COMMUNICATION_PURPOSE_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("message_delivery", ("send", "deliver")),
+    ("qna", ("response", "answer", "formulate")),
+    ("report_generation", ("report",)),
+    ("meeting_attendance", ("meeting",)),
+)
+
+
+def _compile_purpose_pattern(purpose_keywords: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Pattern:
+    """Compile keywords into one regex with a named group per agent; the lookahead allows overlapping hits"""
+    alternatives = "|".join(
+        f"(?P<{agent}>{'|'.join(re.escape(keyword) for keyword in keywords)})"
+        for agent, keywords in purpose_keywords
+    )
+    return re.compile(f"(?=(?:{alternatives}))")
+
+
+_TRACKING_PURPOSE_PATTERN = _compile_purpose_pattern(_TRACKING_PURPOSE_KEYWORDS)
+_COMMUNICATION_PURPOSE_PATTERN = _compile_purpose_pattern(_COMMUNICATION_PURPOSE_KEYWORDS)
+
+_AGENT_PRIORITY: Dict[str, int] = {
+    agent: priority
+    for purpose_keywords in (_TRACKING_PURPOSE_KEYWORDS, _COMMUNICATION_PURPOSE_KEYWORDS)
+    for priority, (agent, _) in enumerate(purpose_keywords)
+}
+
+
+def _match_purpose(pattern: Pattern, purpose_lower: str) -> Optional[str]:
+    """Scan a lowercased task purpose once and return the highest-priority L3 agent it mentions"""
+    agents = (match.lastgroup for match in pattern.finditer(purpose_lower))
+    return min(agents, key=_AGENT_PRIORITY.__getitem__, default=None)
+
+
+# TRACKING_EXECUTION extraction agents: subtask purpose and extraction function
+_TRACKING_EXECUTORS = {
+    "action_item_extraction": ("Extract action items", ActionItemExtraction.run),
+    "risk_extraction": ("Extract risks", RiskExtraction.run),
+    "issue_extraction": ("Extract issues", IssueExtraction.run),
+    "decision_extraction": ("Extract decisions", DecisionExtraction.run),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _subtask_spec(agent_name: str, purpose: str) -> TaskSpec:
+    """Shared immutable spec for an L3 subtask; coordinators only use a handful of these"""
+    return TaskSpec(f"L3:{agent_name}", purpose)
+
 
 class L2Coordinator:
     """Base class for L2 coordinators"""
     
-    def __init__(self, domain: str):
-        self.domain = domain
-        self.visible_l3_agents = get_l3_agents_for_l2(domain)
-        self.gemini_client = None  # Will be set by orchestration engine
+    # L3 agents this coordinator may use; subclasses compute theirs once at class definition
+    visible_l3_agents: FrozenSet[str] = frozenset()
     
-    def set_gemini_client(self, client):
-        """Set the Gemini client for AI-enhanced responses"""
-        self.gemini_client = client
+    def __init__(self, domain: str, gemini_client=None):
+        self.domain = domain
+        self.gemini_client = gemini_client or get_gemini_client()  # Defaults to the shared client
     
     def can_access_l3_agent(self, agent_name: str) -> bool:
         """Check if this L2 can access the specified L3 agent"""
         return agent_name in self.visible_l3_agents
     
-    def coordinate(self, task: Task, message_content: str, project: str, context: Dict[str, Any] = None) -> Task:
+    def coordinate(self, task: Task, message_content: str, project: str, context: Mapping[str, Any] = EMPTY_CONTEXT) -> Task:
         """Coordinate L3 agents to complete the task"""
         raise NotImplementedError("Subclasses must implement coordinate method")
+    
+    def _create_subtask(self, parent_task_id: int, agent_name: str, purpose: str) -> Task:
+        """Create a subtask for L3 agent"""
+        return Task(
+            task_id=parent_task_id,
+            spec=_subtask_spec(agent_name, purpose),
+            id_suffix="-A",
+            status=TaskStatus.IN_PROGRESS
+        )
 
 
 class TrackingExecutionCoordinator(L2Coordinator):
     """L2 Coordinator for TRACKING_EXECUTION domain"""
     
-    def __init__(self):
-        super().__init__("TRACKING_EXECUTION")
+    visible_l3_agents = frozenset(get_l3_agents_for_l2("TRACKING_EXECUTION"))
+    
+    def __init__(self, gemini_client=None):
+        super().__init__("TRACKING_EXECUTION", gemini_client)
     
-    def coordinate(self, task: Task, message_content: str, project: str, context: Dict[str, Any] = None) -> Task:
+    def coordinate(self, task: Task, message_content: str, project: str, context: Mapping[str, Any] = EMPTY_CONTEXT) -> Task:
         """Coordinate tracking and extraction L3 agents"""
-        context = context or {}
+        # Determine which L3 agent to use based on task purpose
+        agent_name = _match_purpose(_TRACKING_PURPOSE_PATTERN, task.purpose_lower)
         
-        # Determine which L3 agents to use based on task purpose
-        purpose_lower = task.purpose.lower()
-        
-        if "action item" in purpose_lower:
-            subtask = self._create_subtask(task.task_id, "action_item_extraction", "Extract action items")
-            executor = ActionItemExtraction(message_content, project)
-            subtask.output = executor.execute()
-            subtask.status = TaskStatus.COMPLETED
-            task.subtasks.append(subtask)
-            
-        elif "risk" in purpose_lower:
-            subtask = self._create_subtask(task.task_id, "risk_extraction", "Extract risks")
-            executor = RiskExtraction(message_content, project)
-            subtask.output = executor.execute()
-            subtask.status = TaskStatus.COMPLETED
-            task.subtasks.append(subtask)
-            
-        elif "issue" in purpose_lower:
-            subtask = self._create_subtask(task.task_id, "issue_extraction", "Extract issues")
-            executor = IssueExtraction(message_content, project)
-            subtask.output = executor.execute()
-            subtask.status = TaskStatus.COMPLETED
-            task.subtasks.append(subtask)
-            
-        elif "decision" in purpose_lower:
-            subtask = self._create_subtask(task.task_id, "decision_extraction", "Extract decisions")
-            executor = DecisionExtraction(message_content, project)
-            subtask.output = executor.execute()
-            subtask.status = TaskStatus.COMPLETED
-            task.subtasks.append(subtask)
+        if agent_name is None:
+            # Fallback if L1 purpose is unclear
+            logger.warning("L2:TRACKING_EXECUTION could not map purpose '%s' to a specific L3 agent.", task.purpose)
+            agent_name = "action_item_extraction"
+            subtask_purpose = "Fallback: attempt extraction"
+        else:
+            subtask_purpose = _TRACKING_EXECUTORS[agent_name][0]
         
+        subtask = self._create_subtask(task.task_id, agent_name, subtask_purpose)
+        extractions = context.get("extractions", {})
+        if agent_name in extractions:
+            # Already extracted together with the sibling tasks of this plan
+            subtask.output = list(extractions[agent_name])
         else:
-            # Fallback if L1 purpose is unclear
-            print(f"Warning: L2:TRACKING_EXECUTION could not map purpose '{task.purpose}' to a specific L3 agent.")
-            subtask = self._create_subtask(task.task_id, "action_item_extraction", "Fallback: attempt extraction")
-            executor = ActionItemExtraction(message_content, project)
-            subtask.output = executor.execute()
-            subtask.status = TaskStatus.COMPLETED
-            task.subtasks.append(subtask)
+            subtask.output = _TRACKING_EXECUTORS[agent_name][1](message_content, project)
+        subtask.status = TaskStatus.COMPLETED
+        task.subtasks.append(subtask)
         
         task.status = TaskStatus.COMPLETED
         return task
     
-    def _create_subtask(self, parent_task_id: str, agent_name: str, purpose: str) -> Task:
-        """Create a subtask for L3 agent"""
-        subtask_id = f"{parent_task_id}-A"
-        return Task(
-            task_id=subtask_id,
-            target_agent=f"L3:{agent_name}",
-            purpose=purpose,
-            status=TaskStatus.IN_PROGRESS
-        )
+    def extract_for_plan(self, tasks: List[Task], message_content: str, project: str) -> Dict[str, List[str]]:
+        """Run the extractions needed by sibling TRACKING_EXECUTION tasks of one plan as a single batch"""
+        kinds = {_match_purpose(_TRACKING_PURPOSE_PATTERN, task.purpose_lower) for task in tasks}
+        kinds.discard(None)
+        if len(kinds) < 2:
+            return {}
+        return CombinedExtraction(message_content, project, kinds).execute()
 
 
 class CommunicationCollaborationCoordinator(L2Coordinator):
     """L2 Coordinator for COMMUNICATION_COLLABORATION domain"""
     
-    def __init__(self):
-        super().__init__("COMMUNICATION_COLLABORATION")
+    visible_l3_agents = frozenset(get_l3_agents_for_l2("COMMUNICATION_COLLABORATION"))
+    
+    def __init__(self, gemini_client=None):
+        super().__init__("COMMUNICATION_COLLABORATION", gemini_client)
     
-    def coordinate(self, task: Task, message_content: str, project: str, context: Dict[str, Any] = None) -> Task:
+    def coordinate(self, task: Task, message_content: str, project: str, context: Mapping[str, Any] = EMPTY_CONTEXT) -> Task:
         """Coordinate communication L3 agents"""
-        context = context or {}
-        purpose_lower = task.purpose.lower()
+        agent_name = _match_purpose(_COMMUNICATION_PURPOSE_PATTERN, task.purpose_lower)
         
-        if "send" in purpose_lower or "deliver" in purpose_lower:
-            subtask = self._create_subtask(task.task_id, "message_delivery", "Send message")
-            # Get sender info from context
-            sender_name = context.get("sender_name", "Unknown")
-            cc_list = context.get("cc_list", [])
-            source = context.get("source", "email")
+        match agent_name:
+            case "message_delivery":
+                subtask = self._create_subtask(task.task_id, "message_delivery", "Send message")
+                # Get sender info from context
+                sender_name = context.get("sender_name", "Unknown")
+                cc_list = context.get("cc_list", [])
+                source = context.get("source", "email")
+                
+                executor = MessageDelivery(message_content, source, sender_name, cc_list)
+                subtask.output = executor.execute()
+                subtask.status = TaskStatus.COMPLETED
+                task.subtasks.append(subtask)
             
-            executor = MessageDelivery(message_content, source, sender_name, cc_list)
-            subtask.output = executor.execute()
-            subtask.status = TaskStatus.COMPLETED
-            task.subtasks.append(subtask)
+            case "qna":
+                subtask = self._create_subtask(task.task_id, "qna", "Formulate response")
+                executor = QnA(message_content, project, context, self.gemini_client)
+                subtask.output = executor.execute()
+                subtask.status = TaskStatus.COMPLETED
+                task.subtasks.append(subtask)
             
-        elif "response" in purpose_lower or "answer" in purpose_lower or "formulate" in purpose_lower:
-            subtask = self._create_subtask(task.task_id, "qna", "Formulate response")
-            executor = QnA(message_content, project, context, self.gemini_client)
-            subtask.output = executor.execute()
-            subtask.status = TaskStatus.COMPLETED
-            task.subtasks.append(subtask)
+            case "report_generation":
+                subtask = self._create_subtask(task.task_id, "report_generation", "Generate report")
+                executor = ReportGeneration(message_content, project, context)
+                subtask.output = executor.execute()
+                subtask.status = TaskStatus.COMPLETED
+                task.subtasks.append(subtask)
             
-        elif "report" in purpose_lower:
-            subtask = self._create_subtask(task.task_id, "report_generation", "Generate report")
-            executor = ReportGeneration(message_content, project, context)
-            subtask.output = executor.execute()
-            subtask.status = TaskStatus.COMPLETED
-            task.subtasks.append(subtask)
+            case "meeting_attendance":
+                subtask = self._create_subtask(task.task_id, "meeting_attendance", "Process meeting")
+                executor = MeetingAttendance(message_content, project)
+                subtask.output = executor.execute()
+                subtask.status = TaskStatus.COMPLETED
+                task.subtasks.append(subtask)
             
-        elif "meeting" in purpose_lower:
-            subtask = self._create_subtask(task.task_id, "meeting_attendance", "Process meeting")
-            executor = MeetingAttendance(message_content, project)
-            subtask.output = executor.execute()
-            subtask.status = TaskStatus.COMPLETED
-            task.subtasks.append(subtask)
-        
-        else:
-            # Fallback if L1 purpose is unclear
-            print(f"Warning: L2:COMMUNICATION_COLLABORATION could not map purpose '{task.purpose}' to a specific L3 agent.")
-            subtask = self._create_subtask(task.task_id, "qna", "Fallback: general acknowledgment")
-            executor = QnA(message_content, project, context, self.gemini_client)
-            subtask.output = executor.execute()
-            subtask.status = TaskStatus.COMPLETED
-            task.subtasks.append(subtask)
+            case _:
+                # Fallback if L1 purpose is unclear
+                logger.warning("L2:COMMUNICATION_COLLABORATION could not map purpose '%s' to a specific L3 agent.", task.purpose)
+                subtask = self._create_subtask(task.task_id, "qna", "Fallback: general acknowledgment")
+                executor = QnA(message_content, project, context, self.gemini_client)
+                subtask.output = executor.execute()
+                subtask.status = TaskStatus.COMPLETED
+                task.subtasks.append(subtask)
         
         task.status = TaskStatus.COMPLETED
         return task
-    
-    def _create_subtask(self, parent_task_id: str, agent_name: str, purpose: str) -> Task:
-        """Create a subtask for L3 agent"""
-        subtask_id = f"{parent_task_id}-A"
-        return Task(
-            task_id=subtask_id,
-            target_agent=f"L3:{agent_name}",
-            purpose=purpose,
-            status=TaskStatus.IN_PROGRESS
-        )
 
 
 class LearningImprovementCoordinator(L2Coordinator):
     """L2 Coordinator for LEARNING_IMPROVEMENT domain"""
     
-    def __init__(self):
-        super().__init__("LEARNING_IMPROVEMENT")
+    visible_l3_agents = frozenset(get_l3_agents_for_l2("LEARNING_IMPROVEMENT"))
     
-    def coordinate(self, task: Task, message_content: str, project: str, context: Dict[str, Any] = None) -> Task:
+    def __init__(self, gemini_client=None):
+        super().__init__("LEARNING_IMPROVEMENT", gemini_client)
+    
+    def coordinate(self, task: Task, message_content: str, project: str, context: Mapping[str, Any] = EMPTY_CONTEXT) -> Task:
         """Coordinate learning L3 agents"""
-        purpose_lower = task.purpose.lower()
+        purpose_lower = task.purpose_lower
         
         if "learn" in purpose_lower or "instruction" in purpose_lower:
             subtask = self._create_subtask(task.task_id, "instruction_led_learning", "Learn from instructions")
@@ -185,19 +227,9 @@ class LearningImprovementCoordinator(L2Coordinator):
         
         task.status = TaskStatus.COMPLETED
         return task
-    
-    def _create_subtask(self, parent_task_id: str, agent_name: str, purpose: str) -> Task:
-        """Create a subtask for L3 agent"""
-        subtask_id = f"{parent_task_id}-A"
-        return Task(
-            task_id=subtask_id,
-            target_agent=f"L3:{agent_name}",
-            purpose=purpose,
-            status=TaskStatus.IN_PROGRESS
-        )
 
 
-def get_l2_coordinator(domain: str) -> L2Coordinator:
+def get_l2_coordinator(domain: str, gemini_client=None) -> L2Coordinator:
     """Factory function to get the appropriate L2 coordinator"""
     coordinators = {
         "TRACKING_EXECUTION": TrackingExecutionCoordinator,
@@ -209,4 +241,4 @@ def get_l2_coordinator(domain: str) -> L2Coordinator:
     if not coordinator_class:
         raise ValueError(f"Unknown L2 domain: {domain}")
     
-    return coordinator_class()
+    return coordinator_class(gemini_client)
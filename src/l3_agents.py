@@ -2,9 +2,40 @@
 L3 Agent Implementations
 Each L3 agent executes specific tasks and returns structured output
 """
+import functools
 import random
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
+import re
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterable, Mapping, Set, Tuple
+from datetime import date, timedelta
+
+# Shared read-only default for agents called without context
+EMPTY_CONTEXT: Mapping[str, Any] = MappingProxyType({})
+
+# Extraction keywords; each extractor reports the ones it finds in this order
+_ACTION_ITEM_KEYWORDS: Tuple[str, ...] = ("add", "create", "implement", "evaluate", "fix", "update", "review", "test")
+# (keyword, likelihood, impact)
+_RISK_KEYWORDS: Tuple[Tuple[str, str, str], ...] = (
+    ("timeline", "HIGH", "HIGH"),
+    ("deadline", "HIGH", "HIGH"),
+    ("blocked", "HIGH", "HIGH"),
+    ("urgent", "MEDIUM", "HIGH"),
+    ("threat", "HIGH", "HIGH"),
+    ("bug", "MEDIUM", "MEDIUM"),
+    ("issue", "MEDIUM", "MEDIUM"),
+    ("scope", "MEDIUM", "MEDIUM"),
+)
+# (keyword, severity)
+_ISSUE_KEYWORDS: Tuple[Tuple[str, str], ...] = (
+    ("blocked", "CRITICAL"),
+    ("down", "CRITICAL"),
+    ("bug", "HIGH"),
+    ("error", "HIGH"),
+    ("problem", "HIGH"),
+    ("issue", "HIGH"),
+    ("broken", "CRITICAL"),
+)
+_DECISION_KEYWORDS: Tuple[str, ...] = ("should we", "can we", "decide", "prioritize", "choose", "approve")
 
 
 # Mock project database for consistent knowledge retrieval
@@ -47,6 +78,32 @@ PROJECT_DB = {
     }
 }
 
+# Knowledge retrieval output per known project, formatted once at import
+_PROJECT_CONTEXT: Dict[str, Tuple[str, ...]] = {
+    project: (
+        f"Project: {project}",
+        f"Current Release Date: {data['release_date']}",
+        f"Days Remaining: {data['days_remaining']}",
+        f"Code Freeze: {data['code_freeze']}",
+        f"Current Progress: {data['progress']}%",
+        f"Team Capacity: {data['capacity']}% utilized",
+        f"Engineering Manager: {data['eng_manager']}",
+        f"Tech Lead: {data['tech_lead']}",
+    )
+    for project, data in PROJECT_DB.items()
+}
+
+
+# Names drawn for the placeholder context of projects missing from PROJECT_DB
+_FALLBACK_MANAGERS = ("Alex Kim", "Sarah Johnson", "Mike Chen")
+_FALLBACK_TECH_LEADS = ("David Park", "Emily Zhang", "Robert Liu")
+
+
+@functools.lru_cache(maxsize=128)
+def _format_future_date(today: date, days: int) -> str:
+    """Format the date some days after today; only a few dozen distinct offsets are ever drawn"""
+    return (today + timedelta(days=days)).strftime("%b %d")
+
 
 class L3AgentExecutor:
     """Base class for L3 agent execution"""
@@ -57,26 +114,56 @@ class L3AgentExecutor:
     
     def generate_random_date(self, days_ahead: int = 30) -> str:
         """Generate a random future date"""
-        future_date = datetime.now() + timedelta(days=random.randint(1, days_ahead))
-        return future_date.strftime("%b %d")
+        return _format_future_date(date.today(), random.randint(1, days_ahead))
+
+
+class KeywordScanner:
+    """Finds which keywords of a fixed (lowercase) set occur in a text, in a single regex pass"""
+    
+    def __init__(self, keywords: Iterable[str]):
+        ordered = sorted(set(keywords), key=len, reverse=True)
+        # One named group per keyword. The longest alternative wins at a shared start position,
+        # the lookahead lets matches overlap, and IGNORECASE saves lowering the text first.
+        alternatives = "|".join(f"(?P<k{index}>{re.escape(keyword)})" for index, keyword in enumerate(ordered))
+        self.pattern = re.compile(f"(?=(?:{alternatives}))", re.IGNORECASE)
+        # Shorter keywords that prefix a match occur at the same position
+        self.implied = {
+            f"k{index}": frozenset(other for other in ordered if keyword.startswith(other))
+            for index, keyword in enumerate(ordered)
+        }
+    
+    def scan(self, text: str) -> Set[str]:
+        """Return the keywords that occur anywhere in the text, ignoring case"""
+        found = set()
+        for match in self.pattern.finditer(text):
+            found |= self.implied[match.lastgroup]
+        return found
 
 
 class ActionItemExtraction(L3AgentExecutor):
     """Extracts action items from message content"""
     
+    KEYWORDS = _ACTION_ITEM_KEYWORDS
+    SCANNER = KeywordScanner(KEYWORDS)
+    
     def execute(self) -> List[str]:
-        # Simulate extraction with dummy data
-        action_items = []
-        counter = 1
-        
-        keywords = ["add", "create", "implement", "evaluate", "fix", "update", "review", "test"]
-        for keyword in keywords:
-            if keyword in self.message_content.lower():
-                action_items.append(
-                    f"AI-{counter:03d}: \"Extract from message: {keyword} related task\"\n"
-                    f"      Owner: ? | Due: ? | Flags: [MISSING_OWNER, MISSING_DUE_DATE]"
-                )
-                counter += 1
+        return self.run(self.message_content, self.project)
+    
+    @classmethod
+    def run(cls, message_content: str, project: str = None) -> List[str]:
+        """Extract action items from message content without instantiating the agent"""
+        return cls.from_keywords(cls.SCANNER.scan(message_content))
+    
+    @classmethod
+    def from_keywords(cls, found: Set[str]) -> List[str]:
+        """Build action items from the keywords found in a message"""
+        # Simulate extraction with dummy data, numbering hits in table order
+        hits = [keyword for keyword in cls.KEYWORDS if keyword in found]
+        action_items = [
+            f"AI-{number:03d}: \"Extract from message: {keyword} related task\"\n"
+            f"      Owner: ? | Due: ? | Flags: [MISSING_OWNER, MISSING_DUE_DATE]"
+            for number, keyword in enumerate(hits, 1)
+        ]
         
         if not action_items:
             action_items.append(
@@ -90,29 +177,26 @@ class ActionItemExtraction(L3AgentExecutor):
 class RiskExtraction(L3AgentExecutor):
     """Extracts risks from message content"""
     
+    KEYWORDS = tuple(keyword for keyword, _, _ in _RISK_KEYWORDS)
+    SCANNER = KeywordScanner(KEYWORDS)
+    
     def execute(self) -> List[str]:
-        risks = []
-        counter = 1
-        
-        # Identify risk patterns
-        risk_keywords = {
-            "timeline": ("HIGH", "HIGH"),
-            "deadline": ("HIGH", "HIGH"),
-            "blocked": ("HIGH", "HIGH"),
-            "urgent": ("MEDIUM", "HIGH"),
-            "threat": ("HIGH", "HIGH"),
-            "bug": ("MEDIUM", "MEDIUM"),
-            "issue": ("MEDIUM", "MEDIUM"),
-            "scope": ("MEDIUM", "MEDIUM"),
-        }
-        
-        for keyword, (likelihood, impact) in risk_keywords.items():
-            if keyword in self.message_content.lower():
-                risks.append(
-                    f"RISK-{counter:03d}: \"Identified: {keyword} concern in message\"\n"
-                    f"      Likelihood: {likelihood} | Impact: {impact}"
-                )
-                counter += 1
+        return self.run(self.message_content, self.project)
+    
+    @classmethod
+    def run(cls, message_content: str, project: str = None) -> List[str]:
+        """Extract risks from message content without instantiating the agent"""
+        return cls.from_keywords(cls.SCANNER.scan(message_content))
+    
+    @classmethod
+    def from_keywords(cls, found: Set[str]) -> List[str]:
+        """Build risks from the keywords found in a message"""
+        hits = [rule for rule in _RISK_KEYWORDS if rule[0] in found]
+        risks = [
+            f"RISK-{number:03d}: \"Identified: {keyword} concern in message\"\n"
+            f"      Likelihood: {likelihood} | Impact: {impact}"
+            for number, (keyword, likelihood, impact) in enumerate(hits, 1)
+        ]
         
         if not risks:
             risks.append(
@@ -126,18 +210,26 @@ class RiskExtraction(L3AgentExecutor):
 class IssueExtraction(L3AgentExecutor):
     """Extracts issues from message content"""
     
+    KEYWORDS = tuple(keyword for keyword, _ in _ISSUE_KEYWORDS)
+    SCANNER = KeywordScanner(KEYWORDS)
+    
     def execute(self) -> List[str]:
-        issues = []
-        counter = 1
-        
-        issue_keywords = ["blocked", "down", "bug", "error", "problem", "issue", "broken"]
-        for keyword in issue_keywords:
-            if keyword in self.message_content.lower():
-                issues.append(
-                    f"ISSUE-{counter:03d}: \"{keyword.capitalize()} identified in message\"\n"
-                    f"      Severity: {'CRITICAL' if keyword in ['down', 'blocked', 'broken'] else 'HIGH'} | Status: OPEN"
-                )
-                counter += 1
+        return self.run(self.message_content, self.project)
+    
+    @classmethod
+    def run(cls, message_content: str, project: str = None) -> List[str]:
+        """Extract issues from message content without instantiating the agent"""
+        return cls.from_keywords(cls.SCANNER.scan(message_content))
+    
+    @classmethod
+    def from_keywords(cls, found: Set[str]) -> List[str]:
+        """Build issues from the keywords found in a message"""
+        hits = [rule for rule in _ISSUE_KEYWORDS if rule[0] in found]
+        issues = [
+            f"ISSUE-{number:03d}: \"{keyword.capitalize()} identified in message\"\n"
+            f"      Severity: {severity} | Status: OPEN"
+            for number, (keyword, severity) in enumerate(hits, 1)
+        ]
         
         if not issues:
             return ["No critical issues identified"]
@@ -148,18 +240,26 @@ class IssueExtraction(L3AgentExecutor):
 class DecisionExtraction(L3AgentExecutor):
     """Extracts decisions from message content"""
     
+    KEYWORDS = _DECISION_KEYWORDS
+    SCANNER = KeywordScanner(KEYWORDS)
+    
     def execute(self) -> List[str]:
-        decisions = []
-        counter = 1
-        
-        decision_keywords = ["should we", "can we", "decide", "prioritize", "choose", "approve"]
-        for keyword in decision_keywords:
-            if keyword in self.message_content.lower():
-                decisions.append(
-                    f"DEC-{counter:03d}: \"Decision needed: {keyword} scenario\"\n"
-                    f"      Decision Maker: ? | Status: PENDING"
-                )
-                counter += 1
+        return self.run(self.message_content, self.project)
+    
+    @classmethod
+    def run(cls, message_content: str, project: str = None) -> List[str]:
+        """Extract decisions from message content without instantiating the agent"""
+        return cls.from_keywords(cls.SCANNER.scan(message_content))
+    
+    @classmethod
+    def from_keywords(cls, found: Set[str]) -> List[str]:
+        """Build decisions from the keywords found in a message"""
+        hits = [keyword for keyword in cls.KEYWORDS if keyword in found]
+        decisions = [
+            f"DEC-{number:03d}: \"Decision needed: {keyword} scenario\"\n"
+            f"      Decision Maker: ? | Status: PENDING"
+            for number, keyword in enumerate(hits, 1)
+        ]
         
         if not decisions:
             decisions.append("No explicit decisions identified")
@@ -167,23 +267,34 @@ class DecisionExtraction(L3AgentExecutor):
         return decisions
 
 
+class CombinedExtraction(L3AgentExecutor):
+    """Runs several extraction agents over the same message as one batch"""
+    
+    EXTRACTORS = {
+        "action_item_extraction": ActionItemExtraction,
+        "risk_extraction": RiskExtraction,
+        "issue_extraction": IssueExtraction,
+        "decision_extraction": DecisionExtraction,
+    }
+    # One scanner over every extractor's keywords, so the message is scanned once for all of them
+    SCANNER = KeywordScanner(keyword for extractor in EXTRACTORS.values() for keyword in extractor.KEYWORDS)
+    
+    def __init__(self, message_content: str, project: str = None, kinds=None):
+        super().__init__(message_content, project)
+        self.kinds = tuple(kinds) if kinds is not None else tuple(self.EXTRACTORS)
+    
+    def execute(self) -> Dict[str, List[str]]:
+        found = self.SCANNER.scan(self.message_content)
+        return {kind: self.EXTRACTORS[kind].from_keywords(found) for kind in self.kinds}
+
+
 class KnowledgeRetrieval(L3AgentExecutor):
     """Retrieves context from knowledge base"""
     
     def execute(self) -> List[str]:
         # Check if project exists in mock database
-        if self.project and self.project in PROJECT_DB:
-            data = PROJECT_DB[self.project]
-            return [
-                f"Project: {self.project}",
-                f"Current Release Date: {data['release_date']}",
-                f"Days Remaining: {data['days_remaining']}",
-                f"Code Freeze: {data['code_freeze']}",
-                f"Current Progress: {data['progress']}%",
-                f"Team Capacity: {data['capacity']}% utilized",
-                f"Engineering Manager: {data['eng_manager']}",
-                f"Tech Lead: {data['tech_lead']}",
-            ]
+        if self.project and self.project in _PROJECT_CONTEXT:
+            return list(_PROJECT_CONTEXT[self.project])
         elif self.project:
             # Project not in database, generate random data
             return [
@@ -193,8 +304,8 @@ class KnowledgeRetrieval(L3AgentExecutor):
                 f"Code Freeze: {self.generate_random_date(20)}",
                 f"Current Progress: {random.randint(60, 90)}%",
                 f"Team Capacity: {random.randint(70, 95)}% utilized",
-                f"Engineering Manager: {random.choice(['Alex Kim', 'Sarah Johnson', 'Mike Chen'])}",
-                f"Tech Lead: {random.choice(['David Park', 'Emily Zhang', 'Robert Liu'])}",
+                f"Engineering Manager: {random.choice(_FALLBACK_MANAGERS)}",
+                f"Tech Lead: {random.choice(_FALLBACK_TECH_LEADS)}",
             ]
         else:
             return [
@@ -206,9 +317,9 @@ class KnowledgeRetrieval(L3AgentExecutor):
 class QnA(L3AgentExecutor):
     """Formulates responses to questions"""
     
-    def __init__(self, message_content: str, project: str, context: Dict[str, Any] = None, gemini_client=None):
+    def __init__(self, message_content: str, project: str, context: Mapping[str, Any] = EMPTY_CONTEXT, gemini_client=None):
         super().__init__(message_content, project)
-        self.context = context or {}
+        self.context = context
         self.gemini_client = gemini_client
     
     def execute(self) -> List[str]:
@@ -229,26 +340,30 @@ class QnA(L3AgentExecutor):
             response_parts.append("")
             response_parts.append("WHAT I KNOW:")
             
-            if self.context.get("knowledge"):
-                for item in self.context["knowledge"]:
-                    response_parts.append(f"• {item}")
+            # Look each context entry up once; the retrieval output is iterated in place
+            knowledge = self.context.get("knowledge")
+            if knowledge:
+                response_parts.extend([f"• {item}" for item in knowledge])
             else:
                 response_parts.append("• Limited project context available")
             
             response_parts.append("")
             response_parts.append("WHAT I'VE LOGGED:")
             
-            if self.context.get("action_items"):
-                count = len(self.context['action_items'])
+            action_items = self.context.get("action_items")
+            risks = self.context.get("risks")
+            decisions = self.context.get("decisions")
+            if action_items:
+                count = len(action_items)
                 response_parts.append(f"• {count} action item{'s' if count != 1 else ''} extracted and tracked")
-            if self.context.get("risks"):
-                count = len(self.context['risks'])
+            if risks:
+                count = len(risks)
                 response_parts.append(f"• {count} risk{'s' if count != 1 else ''} identified and flagged")
-            if self.context.get("decisions"):
-                count = len(self.context['decisions'])
+            if decisions:
+                count = len(decisions)
                 response_parts.append(f"• {count} decision{'s' if count != 1 else ''} pending approval")
             
-            if not any([self.context.get("action_items"), self.context.get("risks"), self.context.get("decisions")]):
+            if not (action_items or risks or decisions):
                 response_parts.append("• No action items, risks, or decisions logged yet")
             
             response_parts.append("")
@@ -307,9 +422,9 @@ class MessageDelivery(L3AgentExecutor):
 class ReportGeneration(L3AgentExecutor):
     """Generates formatted reports"""
     
-    def __init__(self, message_content: str, project: str, context: Dict[str, Any] = None):
+    def __init__(self, message_content: str, project: str, context: Mapping[str, Any] = EMPTY_CONTEXT):
         super().__init__(message_content, project)
-        self.context = context or {}
+        self.context = context
     
     def execute(self) -> List[str]:
         report_parts = ["Meeting Summary Report", ""]
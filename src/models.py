@@ -1,8 +1,11 @@
 """
 Core data models for the Nion Orchestration Engine
 """
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel
+import sys
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Tuple
+from pydantic import TypeAdapter
+from src import scheduler
 from enum import Enum
 
 
@@ -25,36 +28,145 @@ class L2Domain(str, Enum):
     LEARNING_IMPROVEMENT = "LEARNING_IMPROVEMENT"
 
 
-class Sender(BaseModel):
+@dataclass(slots=True)
+class Sender:
     name: str
     role: str
 
 
-class InputMessage(BaseModel):
+@dataclass(slots=True)
+class InputMessage:
     message_id: str
     source: str
     sender: Sender
     content: str
     project: Optional[str] = None
-
-
-class Task(BaseModel):
-    task_id: str
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'InputMessage':
+        """Validate raw input JSON (including the nested sender) and build the message"""
+        return _INPUT_MESSAGE_ADAPTER.validate_python(data)
+
+
+# Input messages are validated once, where raw JSON enters the system
+_INPUT_MESSAGE_ADAPTER = TypeAdapter(InputMessage)
+
+
+class PurposeKind(str, Enum):
+    """What a task's output contributes to the context of its dependents; values are context keys"""
+    KNOWLEDGE = "knowledge"
+    ACTION_ITEMS = "action_items"
+    RISKS = "risks"
+    ISSUES = "issues"
+    DECISIONS = "decisions"
+    RESPONSE = "response"
+    MEETING_INFO = "meeting_info"
+    OTHER = "other"
+
+
+# Purpose keywords in priority order; the first one found in a purpose decides its kind
+_PURPOSE_KEYWORDS = (
+    ("action item", PurposeKind.ACTION_ITEMS),
+    ("risk", PurposeKind.RISKS),
+    ("issue", PurposeKind.ISSUES),
+    ("decision", PurposeKind.DECISIONS),
+)
+
+
+def classify_purpose(target_agent: str, purpose_lower: str) -> PurposeKind:
+    """Classify a task by its target agent and lowercase purpose"""
+    if target_agent == "L3:knowledge_retrieval":
+        return PurposeKind.KNOWLEDGE
+    for keyword, kind in _PURPOSE_KEYWORDS:
+        if keyword in purpose_lower:
+            return kind
+    if "knowledge" in target_agent.lower() or "context" in purpose_lower:
+        return PurposeKind.KNOWLEDGE
+    if "response" in purpose_lower:
+        return PurposeKind.RESPONSE
+    if "meeting" in purpose_lower:
+        return PurposeKind.MEETING_INFO
+    return PurposeKind.OTHER
+
+
+def format_task_id(task_id: int) -> str:
+    """Format an integer task ID for display, e.g. 0 -> TASK-001"""
+    return f"TASK-{task_id + 1:03d}"
+
+
+@dataclass(frozen=True, slots=True)
+class TaskSpec:
+    """Immutable part of a task, shared by every plan built from the same template"""
     target_agent: str  # L2:DOMAIN or L3:agent_name
     purpose: str
-    depends_on: List[str] = []
+    depends_on: Tuple[int, ...] = ()  # IDs of earlier tasks in the same plan
+    is_cross_cutting: bool = False
+    # Lowercase purpose used for keyword dispatch, computed once per spec
+    purpose_lower: str = field(init=False, repr=False, compare=False)
+    purpose_kind: PurposeKind = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Purposes come from a small fixed set, so the lowercase form is interned
+        object.__setattr__(self, "purpose_lower", sys.intern(self.purpose.lower()))
+        object.__setattr__(self, "purpose_kind", classify_purpose(self.target_agent, self.purpose_lower))
+
+
+@dataclass(slots=True)
+class Task:
+    task_id: int  # Sequential position in the plan, starting at 0
+    spec: TaskSpec
     status: TaskStatus = TaskStatus.PENDING
     output: Optional[List[str]] = None
-    subtasks: List['Task'] = []
-    is_cross_cutting: bool = False
-
-
-class L1Plan(BaseModel):
+    subtasks: List['Task'] = field(default_factory=list)
+    id_suffix: str = ""  # Set on L3 subtasks, e.g. "-A"
+    
+    @property
+    def target_agent(self) -> str:
+        return self.spec.target_agent
+    
+    @property
+    def purpose(self) -> str:
+        return self.spec.purpose
+    
+    @property
+    def purpose_lower(self) -> str:
+        return self.spec.purpose_lower
+    
+    @property
+    def purpose_kind(self) -> PurposeKind:
+        return self.spec.purpose_kind
+    
+    @property
+    def depends_on(self) -> Tuple[int, ...]:
+        return self.spec.depends_on
+    
+    @property
+    def is_cross_cutting(self) -> bool:
+        return self.spec.is_cross_cutting
+    
+    @property
+    def display_id(self) -> str:
+        """Human-readable task ID, e.g. TASK-001 or TASK-001-A"""
+        return format_task_id(self.task_id) + self.id_suffix
+
+
+@dataclass(slots=True)
+class L1Plan:
     message: InputMessage
     tasks: List[Task]
-
-
-class OrchestrationResult(BaseModel):
+    
+    def dependency_graph(self) -> scheduler.DependencyGraph:
+        """
+        Return the plan's dependency graph indexed by plan position: a bitmask of the
+        known dependencies of each task (bit i is the task at position i), the
+        dependents of each task, and the tasks that are ready from the start.
+        Dependencies on unknown task IDs are ignored.
+        """
+        return scheduler.dependency_graph(tuple((task.task_id, task.depends_on) for task in self.tasks))
+
+
+@dataclass(slots=True)
+class OrchestrationResult:
     message: InputMessage
     l1_plan: L1Plan
     executed_tasks: List[Task]
@@ -2,21 +2,31 @@
 Main Orchestration Engine
 Coordinates L1, L2, and L3 layers and executes the plan
 """
-from typing import Dict, Any, List
-from src.models import InputMessage, Task, L1Plan, OrchestrationResult, TaskStatus
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Optional
+from src.models import InputMessage, Task, L1Plan, OrchestrationResult, PurposeKind, TaskStatus
 from src.l1_orchestrator import L1Orchestrator
-from src.l2_coordinators import get_l2_coordinator
+from src.l2_coordinators import L2Coordinator, get_l2_coordinator
 from src.l3_agents import KnowledgeRetrieval, Evaluation
-from src.gemini_client import GeminiClient
+from src.gemini_client import get_gemini_client
+from src.scheduler import set_bits
+
+
+# Upper bound on L2/L3 tasks that run at the same time across all messages (Gemini rate limits)
+MAX_PARALLEL_TASKS = 4
 
 
 class OrchestrationEngine:
     """Main orchestration engine that coordinates all layers"""
     
-    def __init__(self):
-        self.l1_orchestrator = L1Orchestrator()
-        self.execution_context = {}
-        self.gemini_client = GeminiClient()
+    def __init__(self, gemini_client=None):
+        # One client (and its pooled connections) is injected into every layer
+        self.gemini_client = gemini_client or get_gemini_client()
+        self.l1_orchestrator = L1Orchestrator(self.gemini_client)
+        # L2 coordinators by plan target (e.g. "L2:TRACKING_EXECUTION"), filled in on first use
+        self._coordinators: Dict[str, L2Coordinator] = {}
+        # Plan tasks of every message share one pool, so concurrent messages do not multiply threads
+        self._executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_TASKS)
     
     def process_message(self, message: InputMessage) -> OrchestrationResult:
         """Process a message through the orchestration pipeline"""
@@ -34,43 +44,62 @@ class OrchestrationEngine:
         )
     
     def _execute_plan(self, plan: L1Plan, message: InputMessage) -> List[Task]:
-        """Execute the L1 plan by delegating to L2/L3 agents"""
-        executed_tasks = []
-        task_outputs = {}  # Store task outputs for dependencies
+        """Execute the L1 plan by delegating to L2/L3 agents, starting each task as soon as its dependencies finish"""
+        # Sibling extraction tasks all scan the same message, so extract for them in one batch
+        tracking_tasks = [task for task in plan.tasks if task.target_agent == "L2:TRACKING_EXECUTION"]
+        extractions = None
+        if tracking_tasks:
+            extractions = self._coordinator("L2:TRACKING_EXECUTION").extract_for_plan(
+                tracking_tasks, message.content, message.project
+            )
         
-        for task in plan.tasks:
-            # Check dependencies
-            if task.depends_on:
-                if not all(dep in task_outputs for dep in task.depends_on):
-                    # Dependencies not met yet, skip for now
-                    continue
-            
-            # Execute task
-            executed_task = self._execute_task(task, message, task_outputs)
-            executed_tasks.append(executed_task)
-            task_outputs[task.task_id] = executed_task
+        tasks = plan.tasks
+        dep_masks, dependents, roots = plan.dependency_graph()
+        completed = 0  # Bit i is set once the task at position i has finished
+        pending = (1 << len(tasks)) - 1  # Bit i is set until the task at position i is submitted
+        task_outputs: List[Optional[Task]] = [None] * len(tasks)  # Finished tasks, by plan position
         
-        # Execute remaining tasks with dependencies
-        remaining_tasks = [t for t in plan.tasks if t.task_id not in task_outputs]
-        for task in remaining_tasks:
-            executed_task = self._execute_task(task, message, task_outputs)
-            executed_tasks.append(executed_task)
-            task_outputs[task.task_id] = executed_task
+        def submit(index: int) -> Future:
+            nonlocal pending
+            pending &= ~(1 << index)
+            return self._executor.submit(self._execute_task, tasks[index], message, task_outputs, dep_masks[index],
+                                         extractions)
         
-        return executed_tasks
+        # Single worklist pass: roots first, then each dependent as soon as it becomes ready
+        running = {submit(index): index for index in roots}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                # Only this thread writes task_outputs, always before the dependents that read it are submitted
+                task_outputs[index] = future.result()
+                completed |= 1 << index
+                for dependent in dependents[index]:
+                    if pending >> dependent & 1 and dep_masks[dependent] & ~completed == 0:
+                        running[submit(dependent)] = dependent
+            
+            if not running and pending:
+                # Whatever is left is caught in a dependency cycle; run it last, as one batch
+                for index in set_bits(pending):
+                    running[submit(index)] = index
+        
+        # Executed tasks are already in plan order
+        return task_outputs
     
-    def _execute_task(self, task: Task, message: InputMessage, task_outputs: Dict[str, Task]) -> Task:
+    def _execute_task(self, task: Task, message: InputMessage, task_outputs: List[Optional[Task]], dep_mask: int = 0,
+                      extractions: Dict[str, List[str]] = None) -> Task:
         """Execute a single task"""
         target = task.target_agent
         
         # Build context from previous tasks
-        context = self._build_context(task, task_outputs, message)
+        context = self._build_context(dep_mask, task_outputs, message)
         
         if target.startswith("L2:"):
             # Delegate to L2 coordinator
-            domain = target.split(":")[1]
-            coordinator = get_l2_coordinator(domain)
-            coordinator.set_gemini_client(self.gemini_client)  # Pass Gemini client
+            coordinator = self._coordinator(target)
+            # Only the tracking coordinator reads batched extractions
+            if extractions and target == "L2:TRACKING_EXECUTION":
+                context["extractions"] = extractions
             return coordinator.coordinate(task, message.content, message.project, context)
             
         elif target.startswith("L3:"):
@@ -80,6 +109,15 @@ class OrchestrationEngine:
         
         return task
     
+    def _coordinator(self, target: str) -> L2Coordinator:
+        """Return the coordinator for an L2 plan target, resolving each target once per engine"""
+        coordinator = self._coordinators.get(target)
+        if coordinator is None:
+            # Workers racing on a new target may each build one; setdefault keeps the first
+            coordinator = get_l2_coordinator(target.split(":")[1], self.gemini_client)
+            coordinator = self._coordinators.setdefault(target, coordinator)
+        return coordinator
+    
     def _execute_cross_cutting_agent(self, task: Task, agent_name: str, message: InputMessage, context: Dict[str, Any]) -> Task:
         """Execute a cross-cutting L3 agent"""
         if agent_name == "knowledge_retrieval":
@@ -96,37 +134,23 @@ class OrchestrationEngine:
         
         return task
     
-    def _build_context(self, task: Task, task_outputs: Dict[str, Task], message: InputMessage) -> Dict[str, Any]:
-        """Build context from previous task outputs"""
+    def _build_context(self, dep_mask: int, task_outputs: List[Optional[Task]], message: InputMessage) -> Dict[str, Any]:
+        """Build context from the outputs of the tasks in a dependency mask (bit i is the task at position i)"""
         context = {
             "sender_name": message.sender.name,
             "source": message.source,
             "cc_list": [],
         }
         
-        # Collect outputs from dependencies
-        for dep_id in task.depends_on:
-            if dep_id in task_outputs:
-                dep_task = task_outputs[dep_id]
-                
-                # If it's a cross-cutting agent (knowledge_retrieval), always add to context
-                if dep_task.target_agent == "L3:knowledge_retrieval":
-                    context["knowledge"] = dep_task.output
-                # Store specific outputs based on task type
-                elif "action item" in dep_task.purpose.lower():
-                    context["action_items"] = dep_task.subtasks[0].output if dep_task.subtasks else []
-                elif "risk" in dep_task.purpose.lower():
-                    context["risks"] = dep_task.subtasks[0].output if dep_task.subtasks else []
-                elif "issue" in dep_task.purpose.lower():
-                    context["issues"] = dep_task.subtasks[0].output if dep_task.subtasks else []
-                elif "decision" in dep_task.purpose.lower():
-                    context["decisions"] = dep_task.subtasks[0].output if dep_task.subtasks else []
-                elif "knowledge" in dep_task.target_agent.lower() or "context" in dep_task.purpose.lower():
-                    context["knowledge"] = dep_task.output
-                elif "response" in dep_task.purpose.lower():
-                    context["response"] = dep_task.subtasks[0].output if dep_task.subtasks else []
-                elif "meeting" in dep_task.purpose.lower():
-                    # Store meeting attendance output for summary reports
-                    context["meeting_info"] = dep_task.subtasks[0].output if dep_task.subtasks else []
+        # Collect outputs from finished dependencies, in plan order
+        for dep_index in set_bits(dep_mask):
+            dep_task = task_outputs[dep_index]
+            if dep_task is not None:
+                # Each kind of dependency fills the context key named after it
+                kind = dep_task.purpose_kind
+                if kind is PurposeKind.KNOWLEDGE:
+                    context[kind.value] = dep_task.output
+                elif kind is not PurposeKind.OTHER:
+                    context[kind.value] = dep_task.subtasks[0].output if dep_task.subtasks else []
         
         return context
@@ -2,7 +2,11 @@
 Output formatter for orchestration results
 Formats the orchestration map according to the specification
 """
-from src.models import OrchestrationResult, Task
+import io
+from typing import Callable, List, TextIO
+from src.models import OrchestrationResult, Task, format_task_id
+
+_RULE = "=" * 70
 
 
 class OutputFormatter:
@@ -10,77 +14,63 @@ class OutputFormatter:
     
     def format(self, result: OrchestrationResult) -> str:
         """Format the orchestration result into a string"""
-        lines = []
+        buffer = io.StringIO()
+        self.write_to(result, buffer)
+        return buffer.getvalue()
+    
+    def write_to(self, result: OrchestrationResult, fp: TextIO):
+        """Stream the formatted orchestration result to a text file, one chunk per line group"""
+        write = fp.write
+        message = result.message
         
         # Header
-        lines.append("=" * 70)
-        lines.append("NION ORCHESTRATION MAP")
-        lines.append("=" * 70)
-        lines.append(f"Message: {result.message.message_id}")
-        lines.append(f"From: {result.message.sender.name} ({result.message.sender.role})")
-        lines.append(f"Project: {result.message.project or 'N/A'}")
-        lines.append("")
+        write(f"{_RULE}\nNION ORCHESTRATION MAP\n{_RULE}\n")
+        write(f"Message: {message.message_id}\n")
+        write(f"From: {message.sender.name} ({message.sender.role})\n")
+        write(f"Project: {message.project or 'N/A'}\n\n")
         
         # L1 Plan
-        lines.append("=" * 70)
-        lines.append("L1 PLAN")
-        lines.append("=" * 70)
+        write(f"{_RULE}\nL1 PLAN\n{_RULE}\n")
         
         for task in result.l1_plan.tasks:
-            lines.append(f"[{task.task_id}] → {task.target_agent}")
-            lines.append(f"Purpose: {task.purpose}")
+            write(f"[{task.display_id}] → {task.target_agent}\nPurpose: {task.purpose}\n")
             if task.depends_on:
-                lines.append(f"Depends On: {', '.join(task.depends_on)}")
-            lines.append("")
+                write(f"Depends On: {', '.join(map(format_task_id, task.depends_on))}\n")
+            write("\n")
         
         # L2/L3 Execution
-        lines.append("=" * 70)
-        lines.append("L2/L3 EXECUTION")
-        lines.append("=" * 70)
-        lines.append("")
+        write(f"{_RULE}\nL2/L3 EXECUTION\n{_RULE}\n\n")
         
         for task in result.executed_tasks:
             if task.target_agent.startswith("L2:"):
-                lines.extend(self._format_l2_task(task))
+                self._format_l2_task(task, write)
             elif task.target_agent.startswith("L3:") and task.is_cross_cutting:
-                lines.extend(self._format_cross_cutting_task(task))
-            lines.append("")
-        
-        lines.append("=" * 70)
+                self._format_cross_cutting_task(task, write)
+            write("\n")
         
-        return "\n".join(lines)
+        write(_RULE)
     
-    def _format_l2_task(self, task: Task) -> list:
+    def _format_l2_task(self, task: Task, write: Callable[[str], int]):
         """Format an L2 task with its subtasks"""
-        lines = []
-        lines.append(f"[{task.task_id}] {task.target_agent}")
+        write(f"[{task.display_id}] {task.target_agent}\n")
         
         for subtask in task.subtasks:
-            lines.append(f"└─▶ [{subtask.task_id}] {subtask.target_agent}")
-            lines.append(f"    Status: {subtask.status.value}")
+            write(f"└─▶ [{subtask.display_id}] {subtask.target_agent}\n    Status: {subtask.status.value}\n")
             if subtask.output:
-                lines.append("    Output:")
-                for output_line in subtask.output:
-                    # Check if line already starts with a bullet
-                    if output_line.strip().startswith("•"):
-                        lines.append(f"    {output_line}")
-                    else:
-                        lines.append(f"    • {output_line}")
-        
-        return lines
+                write("    Output:\n")
+                self._format_output(subtask.output, "    ", write)
     
-    def _format_cross_cutting_task(self, task: Task) -> list:
+    def _format_cross_cutting_task(self, task: Task, write: Callable[[str], int]):
         """Format a cross-cutting L3 task"""
-        lines = []
-        lines.append(f"[{task.task_id}] {task.target_agent} (Cross-Cutting)")
-        lines.append(f"Status: {task.status.value}")
+        write(f"[{task.display_id}] {task.target_agent} (Cross-Cutting)\nStatus: {task.status.value}\n")
         if task.output:
-            lines.append("Output:")
-            for output_line in task.output:
-                # Check if line already starts with a bullet
-                if output_line.strip().startswith("•"):
-                    lines.append(f"{output_line}")
-                else:
-                    lines.append(f"• {output_line}")
-        
-        return lines
+            write("Output:\n")
+            self._format_output(task.output, "", write)
+    
+    def _format_output(self, output: List[str], indent: str, write: Callable[[str], int]):
+        """Format output lines as bullets, keeping lines that already start with one"""
+        for output_line in output:
+            if output_line.lstrip().startswith("•"):
+                write(f"{indent}{output_line}\n")
+            else:
+                write(f"{indent}• {output_line}\n")
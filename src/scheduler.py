@@ -0,0 +1,41 @@
+"""
+Plan dependency scheduling
+Integer bitmask routines over plan positions. Plans come from a handful of templates,
+so each dependency graph is computed once per plan shape and then reused.
+"""
+import functools
+from typing import Iterator, NamedTuple, Tuple
+
+# A plan's shape: (task_id, depends_on) for each task, in plan order
+PlanShape = Tuple[Tuple[int, Tuple[int, ...]], ...]
+
+
+class DependencyGraph(NamedTuple):
+    """Dependency graph of a plan, indexed by plan position"""
+    dep_masks: Tuple[int, ...]  # Known dependencies of each task; bit i is the task at position i
+    dependents: Tuple[Tuple[int, ...], ...]  # Positions of the tasks that depend on each task
+    roots: Tuple[int, ...]  # Positions of the tasks without known dependencies, in plan order
+
+
+def set_bits(mask: int) -> Iterator[int]:
+    """Yield the positions of the set bits of a mask, lowest first"""
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+@functools.lru_cache(maxsize=64)
+def dependency_graph(shape: PlanShape) -> DependencyGraph:
+    """Build the dependency graph of a plan shape; dependencies on unknown task IDs are ignored"""
+    position = {task_id: index for index, (task_id, _) in enumerate(shape)}
+    dep_masks = [0] * len(shape)
+    dependents = [[] for _ in shape]
+    for index, (_, depends_on) in enumerate(shape):
+        for dep in depends_on:
+            dep_index = position.get(dep)
+            if dep_index is not None:
+                dep_masks[index] |= 1 << dep_index
+                dependents[dep_index].append(index)
+    roots = tuple(index for index, mask in enumerate(dep_masks) if mask == 0)
+    return DependencyGraph(tuple(dep_masks), tuple(map(tuple, dependents)), roots)